@@ -8,6 +8,7 @@ Usage:
     inquestlabs [options] dfi details <sha256> [--attributes]
     inquestlabs [options] dfi download <sha256> <path>
     inquestlabs [options] dfi attributes <sha256> [--filter=<filter>]
+    inquestlabs [options] dfi bulk-details <path>
     inquestlabs [options] dfi search (code|context|metadata|ocr) <keyword>
     inquestlabs [options] dfi search (md5|sha1|sha256|sha512) <hash>
     inquestlabs [options] dfi search (domain|email|filename|ip|url|xmpid) <ioc>
@@ -27,12 +28,14 @@ Usage:
 
 Options:
     --api=<apikey>      Specify an API key.
+    --clear-cache       Clear the persistent HTTP response cache before running.
     --config=<config>   Configuration file with API key [default: ~/.iqlabskey].
     --debug             Docopt debugging.
     --filter=<filter>   Filter by attributes type (domain, email, filename, ip, url, xmpid)
     -h --help           Show this screen.
     --hex               Treat <instring> as hex bytes.
     -l --limits         Show remaining API credits and limit reset window.
+    --no-cache          Bypass the persistent HTTP response cache.
     --proxy=<proxy>     Intermediate proxy
     --verbose=<level>   Verbosity level, outputs to stderr [default: 0].
     --version           Show version.
@@ -41,38 +44,103 @@ Options:
 # python 2/3 compatability.
 from __future__ import print_function
 
-try:
-    import configparser
-except:
-    import ConfigParser as configparser
-
 # batteries not included.
 import docopt
-import requests
+
+# heavy imports (requests pulls in urllib3, charset normalization, et al.) are deferred to first use so that
+# parse-only invocations like --help don't pay their cold-start cost. bound at module scope on first need.
+requests = None
+
+# optional batteries, only required for the asynchronous batch interfaces. deferred to first use like requests above,
+# aiohttp drags in multidict, yarl, and friends. bound at module scope by dfi_details_many() on first need.
+aiohttp = None
 
 # standard libraries.
-import hashlib
-import random
+import functools
+import operator
 import time
 import json
 import sys
 import os
 import re
 
+# optional batteries, markedly faster JSON encode/decode for the large list/search payloads when available.
+try:
+    import orjson
+
+    def _loads (data):
+        return orjson.loads(data)
+
+    def _dumps (obj):
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+
+    def _loads (data):
+        return json.loads(data)
+
+    def _dumps (obj):
+        return json.dumps(obj)
+
 __version__ = 1.0
 
-VALID_CAT  = ["ext", "hash", "ioc"]
-VALID_EXT  = ["code", "context", "metadata", "ocr"]
-VALID_HASH = ["md5", "sha1", "sha256", "sha512"]
-VALID_IOC  = ["domain", "email", "filename", "ip", "url", "xmpid"]
+VALID_CAT  = frozenset(("ext", "hash", "ioc"))
+VALID_EXT  = frozenset(("code", "context", "metadata", "ocr"))
+VALID_HASH = frozenset(("md5", "sha1", "sha256", "sha512"))
+VALID_IOC  = frozenset(("domain", "email", "filename", "ip", "url", "xmpid"))
+
+# category to subcategory mapping with O(1) membership checks for the validation hot paths.
+SUBCATS = \
+{
+    "ext"  : VALID_EXT,
+    "hash" : VALID_HASH,
+    "ioc"  : VALID_IOC,
+}
+
+# error message fodder, joined once at module load instead of inside each raise path.
+_STR_CAT     = ", ".join(sorted(VALID_CAT))
+_STR_IOC     = ", ".join(sorted(VALID_IOC))
+_STR_SUBCATS = dict((category, ", ".join(sorted(subcategories))) for category, subcategories in SUBCATS.items())
+
+# file types eligible for DFI upload and the magic prefixes we accept: OLE for pre-2007 Office files and ZIP for the
+# post-2007 XML-based formats.
+UPLOAD_TYPES = ["doc", "docx", "ppt", "pptx", "xls", "xlsx"]
+_OLE_MAGIC   = b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1"
+_ZIP_MAGIC   = b"PK\x03\x04"
 
 # verbosity levels.
 INFO  = 1
 DEBUG = 2
 
+########################################################################################################################
+@functools.lru_cache(maxsize=256)
+def _join (base, api):
+    """
+    Memoized endpoint URL construction, repeat calls against the same endpoint share one interned string.
+    """
+
+    return base + api
+
+########################################################################################################################
+@functools.lru_cache(maxsize=32)
+def _search_url (category, subcategory):
+    """
+    Memoized DFI search endpoint construction, the category/subcategory combinations are bounded so the cache is
+    fully warm after a handful of calls.
+    """
+
+    return "/dfi/search/%s/%s" % (category, subcategory)
+
 ########################################################################################################################
 class inquestlabs_exception(Exception):
-    pass
+    """
+    Labs API failure. carries the triggering HTTP status code, when there is one, so callers can branch on .status
+    without parsing the rendered message.
+    """
+
+    def __init__ (self, message, status=None):
+        Exception.__init__(self, message)
+        self.status = status
 
 ########################################################################################################################
 class inquestlabs_api:
@@ -82,7 +150,8 @@ class inquestlabs_api:
     """
 
     ####################################################################################################################
-    def __init__ (self, api_key=None, config=None, proxies=None, base_url=None, retries=3, verify_ssl=True, verbose=0):
+    def __init__ (self, api_key=None, config=None, proxies=None, base_url=None, retries=3, verify_ssl=True, verbose=0,
+                  http_cache=True):
         """
         Instantiate an interface to InQuest Labs. API key is optional but sourced from (in order): argument, environment
         variable, or configuration file. Proxy dictionary is a raw pass thru to python-requests, valid keys are 'http'
@@ -102,8 +171,16 @@ class inquestlabs_api:
         :param verify_ssl: Toggles SSL certificate verification when communicating with the API.
         :type  verbose:    int
         :param verbose:    Values greater than zero provide increased verbosity.
+        :type  http_cache: bool
+        :param http_cache: Persistently cache GET responses on disk, requires the optional 'requests-cache' dependency.
         """
 
+        # deferred heavy import, see note at module top.
+        global requests
+
+        if requests is None:
+            import requests
+
         # internalize supplied parameters.
         self.api_key     = api_key
         self.base_url    = base_url
@@ -120,6 +197,52 @@ class inquestlabs_api:
         self.rlimit_seconds_to_reset   = None   # seconds to reset time.
         self.api_requests_made         = 0      # keep track of how many API requests we've made.
 
+        # in-process TTL cache fronting endpoints whose responses rarely change within a run.
+        self._cache     = {}
+        self._cache_ttl = 300
+
+        # truncated exponential back-off with jitter, honoring Retry-After, on transient failures and retryable status
+        # codes. handled at the transport layer by urllib3 so the API hot path stays free of sleep/loop logic. when the
+        # status retries are spent the final response is returned, not raised, so API() can report its status and body.
+        retry = requests.adapters.Retry(
+            total                      = self.retries,
+            backoff_factor             = 0.4,
+            backoff_jitter             = 0.5,
+            status_forcelist           = (429, 500, 502, 503, 504),
+            allowed_methods            = frozenset(["GET", "POST"]),
+            respect_retry_after_header = True,
+            raise_on_status            = False)
+
+        # optional batteries, persistent on-disk caching of GET responses for cross-process reuse. ETag/Cache-Control
+        # aware and friendlier to the API rate limits, uploads and other POSTs always bypass it.
+        if http_cache:
+            try:
+                import requests_cache
+            except ImportError:
+                requests_cache = None
+        else:
+            requests_cache = None
+
+        # spin up a single session so HTTPS keep-alive re-uses the underlying socket across API calls. the adapter
+        # carries its own connection pool and retry policy.
+        if requests_cache is not None:
+            self.session = requests_cache.CachedSession(
+                cache_name        = os.path.expanduser("~/.iqlabs_cache"),
+                backend           = "sqlite",
+                expire_after      = 300,
+                allowable_methods = ("GET",),
+                cache_control     = True)
+        else:
+            self.session = requests.Session()
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+
+        self.session.mount("https://", adapter)
+        self.session.mount("http://",  adapter)
+
+        self.session.proxies = self.proxies
+        self.session.verify  = self.verify_ssl
+
         # if no base URL was specified, use the default.
         if self.base_url is None:
             self.base_url = "https://labs.inquest.net/api"
@@ -158,6 +281,11 @@ class inquestlabs_api:
                 #   apikey: deadbeefdeadbeefdeadbeefdeadbeefdeadbeef
                 if os.path.exists(self.config_file) and os.path.isfile(self.config_file):
 
+                    try:
+                        import configparser
+                    except ImportError:
+                        import ConfigParser as configparser
+
                     config = configparser.ConfigParser()
 
                     try:
@@ -177,8 +305,40 @@ class inquestlabs_api:
             self.__VERBOSE("api_key=%s" % self.api_key, DEBUG)
             self.__VERBOSE("api_key_source=%s" % self.api_key_source, INFO)
 
+        # explicitly advertise compressed encodings, the JSON list/search payloads are highly compressible. brotli is
+        # only offered when a decoder is importable, otherwise we couldn't unpack what the server sends back.
+        accept_encoding = "gzip, deflate"
+
+        try:
+            import brotli                   # noqa: F401
+            accept_encoding += ", br"
+        except ImportError:
+            pass
+
+        # headers are invariant for the life of the instance, build them once and park them on the session so each
+        # API call skips the per-request dict construction and string formatting.
+        self._headers = \
+        {
+            "User-Agent"      : "python-inquestlabs/%s" % __version__,
+            "Accept-Encoding" : accept_encoding,
+        }
+
+        if self.api_key:
+            self._headers["Authorization"] = "Basic: %s" % self.api_key
+
+        self.session.headers.update(self._headers)
+
     ####################################################################################################################
-    def API (self, api, data=None, path=None, method="GET", raw=False):
+    def close (self):
+        """
+        Release the pooled HTTP connections held by the underlying session. Long-lived callers should invoke this when
+        done talking to the API, one-shot CLI usage gets it for free via main().
+        """
+
+        self.session.close()
+
+    ####################################################################################################################
+    def API (self, api, data=None, path=None, method="GET", raw=False, stream=False):
         """
         Internal API wrapper.
 
@@ -192,63 +352,58 @@ class inquestlabs_api:
         :param method: API method, one of "GET" or "POST".
         :type  raw:    bool
         :param raw:    Default behavior is to expect JSON encoded content, raise this flag to expect raw data.
+        :type  stream: bool
+        :param stream: Raise this flag to stream the response body, the response object is returned as-is.
 
-        :rtype:  dict | str
-        :return: Response dictionary or string if 'raw' flag is raised.
+        :rtype:  dict | str | requests.Response
+        :return: Response dictionary, string if 'raw' flag is raised, or response object if 'stream' flag is raised.
         """
 
         assert method in ["GET", "POST"]
 
-        # if a file path was supplied, convert to a dictionary compatible with requests and the labs API.
-        files = None
-
+        # if a file path was supplied, prefer a streaming multipart encoder so the file is fed from disk to the socket
+        # in chunks, falling back to the buffering requests file dictionary when the toolbelt isn't available. either
+        # way, we own the file handle and close it when the request completes. the common file-less path skips all of
+        # this and rides the session with no per-call allocations.
         if path:
-            files = dict(file=open(path, "rb"))
+            fh = open(path, "rb")
 
-        # initialize headers with a custom user-agent and if an API key is available, add an authorization header.
-        headers = \
-        {
-            "User-Agent" : "python-inquestlabs/%s" % __version__
-        }
-
-        if self.api_key:
-            headers["Authorization"] = "Basic: %s" % self.api_key
-
-        # build the keyword arguments that will be passed to requests library.
-        kwargs = \
-        {
-            "data"    : data,
-            "files"   : files,
-            "headers" : headers,
-            "proxies" : self.proxies,
-            "verify"  : self.verify_ssl,
-        }
+            # optional batteries, enables streaming file uploads with constant memory usage.
+            try:
+                from requests_toolbelt import MultipartEncoder
+            except ImportError:
+                MultipartEncoder = None
+
+            if MultipartEncoder is not None and method == "POST":
+                files   = None
+                data    = MultipartEncoder(fields=dict(file=(os.path.basename(path), fh, "application/octet-stream")))
+                headers = {"Content-Type": data.content_type}
+            else:
+                files   = dict(file=fh)
+                headers = None
+        else:
+            fh = files = headers = None
 
-        # make attempts to dance with the API endpoint, use a jittered exponential back-off delay.
-        endpoint = self.base_url + api
-        attempt  = 0
+        # dance with the API endpoint. headers ride along on the session and retries with jittered exponential
+        # back-off are handled by the mounted urllib3 Retry policy, so a raised transport error means the budget is
+        # spent. persistent 429/5xx responses come back as-is and fall through to the status handling below.
+        endpoint = _join(self.base_url, api)
 
         self.__VERBOSE("%s %s" % (method, endpoint), INFO)
 
-        while 1:
-            try:
-                response = requests.request(method, endpoint, **kwargs)
-                self.api_requests_made += 1
-                self.__VERBOSE("[%d] %s" % (self.api_requests_made, kwargs), DEBUG)
-                break
-
-            except Exception as e:
-                self.__VERBOSE("API exception: %s" % e, INFO)
-
-                # 0.4, 1.6, 6.4, 25.6, ...
-                time.sleep(random.uniform(0, 4 ** attempt * 100 / 1000.0))
-                attempt += 1
-
-            # retries exhausted.
-            if attempt == self.retries:
-                message = "exceeded %s attempts to communicate with InQuest Labs API endpoint %s."
-                message %= self.retries, endpoint
-                raise inquestlabs_exception(message)
+        try:
+            response = self.session.request(method, endpoint, data=data, files=files, headers=headers, stream=stream)
+        except requests.exceptions.RequestException as e:
+            self.__VERBOSE("API exception: %s" % e, INFO)
+            message  = "exceeded %s attempts to communicate with InQuest Labs API endpoint %s."
+            message %= self.retries + 1, endpoint
+            raise inquestlabs_exception(message)
+        finally:
+            if fh:
+                fh.close()
+
+        self.api_requests_made += 1
+        self.__VERBOSE("[%d] %s %s" % (self.api_requests_made, method, endpoint), DEBUG)
 
         # update internal rate limit tracking variables.
         if hasattr(response, "headers"):
@@ -264,17 +419,25 @@ class inquestlabs_api:
                 self.rlimit_reset_epoch_ctime = time.ctime(self.rlimit_reset_epoch_time)
 
         self.__VERBOSE("API status_code=%d" % response.status_code, INFO)
-        self.__VERBOSE(response.content, DEBUG)
+
+        # NOTE: peeking at .content here would slurp a streamed body into memory, so only do so when not streaming.
+        if not stream:
+            self.__VERBOSE(response.content, DEBUG)
 
         # all good.
         if response.status_code == 200:
 
+            # if the stream flag was raised, hand the live response object back to the caller.
+            if stream:
+                return response
+
             # if the raw flag was raised, return raw content now.
             if raw:
                 return response.content
 
-            # otherwise, we convert the assumed JSON response to a python dictionary.
-            response_json = response.json()
+            # otherwise, we convert the assumed JSON response to a python dictionary. decoding the raw content
+            # ourselves lets orjson, when available, skip the text decode round-trip.
+            response_json = _loads(response.content)
 
             # with a 200 status code, success should always be true...
             if response_json['success']:
@@ -284,11 +447,11 @@ class inquestlabs_api:
             else:
                 message  = "status=200 but error communicating with %s: %s"
                 message %= endpoint, response_json.get("error", "n/a")
-                raise inquestlabs_exception(message)
+                raise inquestlabs_exception(message, status=200)
 
         # rate limit exhaustion.
         elif response.status_code == 429:
-            raise inquestlabs_exception("status=429 rate limit exhausted!")
+            raise inquestlabs_exception("status=429 rate limit exhausted!", status=429)
 
         # something else went wrong.
         else:
@@ -296,15 +459,123 @@ class inquestlabs_api:
             message %= response.status_code, endpoint
 
             try:
-                response_json = response.json()
+                response_json = _loads(response.content)
                 message += response_json.get("error", "n/a")
             except:
                 message += str(response.content)
 
-            raise inquestlabs_exception(message)
+            raise inquestlabs_exception(message, status=response.status_code)
+
+    ####################################################################################################################
+    def _cached_api (self, api, data=None, ttl=None):
+        """
+        TTL-cached front-end to API() for endpoints whose responses rarely change within a run (sources, stats, and
+        friends). Repeat calls inside the TTL window short-circuit the network entirely.
+
+        :type  api:  str
+        :param api:  API endpoint, appended to base URL.
+        :type  data: dict
+        :param data: Optional data dictionary to pass to endpoint.
+        :type  ttl:  int
+        :param ttl:  Optional cache lifetime in seconds, defaults to the instance-wide TTL.
+
+        :rtype:  dict | list
+        :return: API response, possibly served from cache.
+        """
+
+        if ttl is None:
+            ttl = self._cache_ttl
+
+        key    = (api, tuple(sorted((data or {}).items())))
+        cached = self._cache.get(key)
+
+        if cached and cached[0] > time.time():
+            self.__VERBOSE("cache hit on %s" % api, DEBUG)
+            return cached[1]
+
+        value = self.API(api, data)
+        self._cache[key] = (time.time() + ttl, value)
+
+        return value
+
+    ####################################################################################################################
+    def invalidate_cache (self):
+        """
+        Drop any cached API responses. Long-lived callers can use this to force fresh data mid-run.
+        """
+
+        self._cache.clear()
+
+    ####################################################################################################################
+    async def _api_async (self, session, api, data=None, method="GET", raw=False):
+        """
+        Asynchronous flavor of API(), riding atop a caller supplied aiohttp session. Behaves like its synchronous
+        sibling but leaves connection pooling and concurrency limits to the session/connector.
+
+        :type  session: aiohttp.ClientSession
+        :param session: Shared aiohttp session to issue the request on.
+        :type  api:     str
+        :param api:     API endpoint, appended to base URL.
+        :type  data:    dict
+        :param data:    Optional data dictionary to pass to endpoint.
+        :type  method:  str
+        :param method:  API method, one of "GET" or "POST".
+        :type  raw:     bool
+        :param raw:     Default behavior is to expect JSON encoded content, raise this flag to expect raw data.
+
+        :rtype:  dict | bytes
+        :return: Response dictionary or bytes if 'raw' flag is raised.
+        """
+
+        assert method in ["GET", "POST"]
+
+        endpoint = _join(self.base_url, api)
+
+        self.__VERBOSE("%s %s (async)" % (method, endpoint), INFO)
+
+        async with session.request(method, endpoint, data=data, headers=self._headers) as response:
+            self.api_requests_made += 1
+            self.__VERBOSE("API status_code=%d" % response.status, INFO)
+
+            # all good.
+            if response.status == 200:
+
+                # if the raw flag was raised, return raw content now.
+                if raw:
+                    return await response.read()
+
+                # otherwise, we convert the assumed JSON response to a python dictionary.
+                response_json = _loads(await response.read())
+
+                # with a 200 status code, success should always be true...
+                if response_json['success']:
+                    return response_json['data']
+
+                # ... but let's handle corner cases where it may not be.
+                else:
+                    message  = "status=200 but error communicating with %s: %s"
+                    message %= endpoint, response_json.get("error", "n/a")
+                    raise inquestlabs_exception(message, status=200)
+
+            # rate limit exhaustion.
+            elif response.status == 429:
+                raise inquestlabs_exception("status=429 rate limit exhausted!", status=429)
+
+            # something else went wrong.
+            else:
+                message  = "status=%d error communicating with %s: "
+                message %= response.status, endpoint
+
+                try:
+                    response_json = _loads(await response.read())
+                    message += response_json.get("error", "n/a")
+                except Exception:
+                    message += str(await response.read())
+
+                raise inquestlabs_exception(message, status=response.status)
 
     ####################################################################################################################
-    def __HASH (self, path=None, bytes=None, algorithm="md5", block_size=16384, fmt="digest"):
+    def __HASH (self, path=None, bytes=None, algorithm="md5", fmt="digest"):
         """
         Return the selected algorithms crytographic hash hex digest of the given file.
 
@@ -314,8 +585,6 @@ class inquestlabs_api:
         :param bytes:      str bytes to hash or None if supplying a path to a file.
         :type  algorithm:  str
         :param algorithm:  One of "md5", "sha1", "sha256" or "sha512".
-        :type  block_size: int
-        :param block_size: Size of blocks to process.
         :type  fmt:        str
         :param fmt:        One of "digest" (str), "raw" (hashlib object), "parts" (array of numeric parts).
 
@@ -323,9 +592,7 @@ class inquestlabs_api:
         :return: Hash as hex digest.
         """
 
-        def chunks (l, n):
-            for i in range(0, len(l), n):
-                yield l[i:i+n]
+        import hashlib
 
         algorithm = algorithm.lower()
 
@@ -336,18 +603,29 @@ class inquestlabs_api:
 
         # hash a file.
         if path:
-            with open(path, "rb") as fh:
-                while 1:
-                    data = fh.read(block_size)
 
-                    if not data:
-                        break
+            # hashlib.file_digest (3.11+) feeds OpenSSL from a reusable buffer entirely in C.
+            if hasattr(hashlib, "file_digest"):
+                with open(path, "rb") as fh:
+                    hashfunc = hashlib.file_digest(fh, algorithm)
+
+            # older interpreters fall back to a readinto() loop over a reusable 1 MiB buffer.
+            else:
+                with open(path, "rb", buffering=0) as fh:
+                    buf = bytearray(1 << 20)
+                    mv  = memoryview(buf)
+
+                    while 1:
+                        n = fh.readinto(buf)
+
+                        if not n:
+                            break
 
-                    hashfunc.update(data)
+                        hashfunc.update(mv[:n])
 
-        # hash a stream of bytes.
+        # hash a stream of bytes, a memoryview avoids copying when a mutable buffer is handed in.
         elif bytes:
-            hashfunc.update(bytes)
+            hashfunc.update(memoryview(bytes))
 
         # error.
         else:
@@ -358,7 +636,8 @@ class inquestlabs_api:
             return hashfunc
 
         elif fmt == "parts":
-            return map(lambda x: int(x, 16), list(chunks(hashfunc.hexdigest(), 8)))
+            digest = hashfunc.digest()
+            return [int.from_bytes(digest[i:i+4], "big") for i in range(0, len(digest), 4)]
 
         else: # digest
             return hashfunc.hexdigest()
@@ -433,13 +712,20 @@ class inquestlabs_api:
 
             if filter_by not in VALID_IOC:
                 message  = "invalid attribute filter '%s'. valid filters include: %s"
-                message %= filter_by, ", ".join(VALID_IOC)
+                message %= filter_by, _STR_IOC
                 raise inquestlabs_exception(message)
 
-        # dance with the API.
-        attributes = self.API("/dfi/details/attributes", dict(sha256=sha256))
+        # when a filter is specified, pass it along so the server can pre-filter and the response scales with the
+        # filtered result rather than the full attribute list.
+        if filter_by:
+            data = dict(sha256=sha256, attribute=filter_by)
+        else:
+            data = dict(sha256=sha256)
 
-        # filter if necessary.
+        # dance with the API. attributes for a given hash are stable enough to cache briefly for per-hash fanouts.
+        attributes = self._cached_api("/dfi/details/attributes", data, ttl=60)
+
+        # filter locally as well, in case the endpoint ignores the hint. itemgetter keeps the per-element work in C.
         if filter_by:
             # sample data:
             #     [
@@ -456,7 +742,8 @@ class inquestlabs_api:
             #         "value": "Application.Top"
             #       }
             #     ]
-            attributes = [attr for attr in attributes if attr['attribute'] == filter_by]
+            get        = operator.itemgetter("attribute")
+            attributes = [attr for attr in attributes if get(attr) == filter_by]
 
         # return attributes.
         return attributes
@@ -516,6 +803,88 @@ class inquestlabs_api:
 
         return data
 
+    ####################################################################################################################
+    def dfi_details_many (self, sha256s, attributes=False, concurrency=64):
+        """
+        Retrieve details for a batch of files by SHA256 hash values, fanning the underlying API requests out
+        concurrently so N lookups complete in roughly the time of the slowest one rather than the sum of all of them.
+        Requires the optional 'aiohttp' dependency. See dfi_details() for the shape of each returned dictionary.
+
+        :type  sha256s:     list
+        :param sha256s:     SHA256 hashes for the files we are interested in.
+        :type  attributes:  bool
+        :param attributes:  Raise this flag to include the 'attributes' subkey on each entry.
+        :type  concurrency: int
+        :param concurrency: Maximum number of in-flight API requests.
+
+        :rtype:  list
+        :return: List of API responses, in the same order as 'sha256s'.
+        """
+
+        for sha256 in sha256s:
+            assert self.is_sha256(sha256)
+
+        # deferred optional import, see note at module top. bail with a descriptive message if it isn't available.
+        global aiohttp
+
+        if aiohttp is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise inquestlabs_exception("dfi_details_many() requires the optional 'aiohttp' dependency.")
+
+        import asyncio
+
+        return asyncio.run(self.__dfi_details_many(sha256s, attributes, concurrency))
+
+    ####################################################################################################################
+    def dfi_details_batch (self, sha256s, attributes=False, max_workers=16):
+        """
+        Retrieve details for a batch of files by SHA256 hash values, issuing the underlying API requests from a thread
+        pool atop the pooled session. A dependency-free alternative to dfi_details_many() for I/O-bound fanouts, keep
+        'max_workers' at or below the session adapter's pool size (20) so threads re-use pooled connections. See
+        dfi_details() for the shape of each returned dictionary.
+
+        :type  sha256s:     list
+        :param sha256s:     SHA256 hashes for the files we are interested in.
+        :type  attributes:  bool
+        :param attributes:  Raise this flag to include the 'attributes' subkey on each entry.
+        :type  max_workers: int
+        :param max_workers: Maximum number of worker threads issuing API requests.
+
+        :rtype:  list
+        :return: List of API responses, in the same order as 'sha256s'.
+        """
+
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda sha256: self.dfi_details(sha256, attributes), sha256s))
+
+    ####################################################################################################################
+    async def __dfi_details_many (self, sha256s, attributes, concurrency):
+        """
+        Asynchronous workhorse behind dfi_details_many(), one aiohttp session shared across a semaphore-bounded fanout.
+        """
+
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit_per_host=concurrency, ssl=bool(self.verify_ssl))
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+
+            async def fetch (sha256):
+                async with semaphore:
+                    data = await self._api_async(session, "/dfi/details", dict(sha256=sha256))
+
+                    if attributes:
+                        data['attributes'] = await self._api_async(session, "/dfi/details/attributes", dict(sha256=sha256))
+
+                    return data
+
+            return await asyncio.gather(*map(fetch, sha256s))
+
     ####################################################################################################################
     def dfi_download (self, sha256, path):
         """
@@ -527,24 +896,29 @@ class inquestlabs_api:
         :param path:   Where we want to save the file.
         """
 
+        import hashlib
+
         assert self.is_sha256(sha256)
 
-        # NOTE: we're reading the file directly into memory here! not worried about it as the files are small and we
-        # done anticipate any OOM issues.
-        data = self.API("/dfi/download", dict(sha256=sha256), raw=True)
+        # stream the download straight to disk, hashing as we go, so we never hold the entire file in memory.
+        response = self.API("/dfi/download", dict(sha256=sha256), stream=True)
+        hashfunc = hashlib.sha256()
+
+        with open(path, "wb+") as fh:
+            for chunk in response.iter_content(chunk_size=65536):
+                hashfunc.update(chunk)
+                fh.write(chunk)
 
-        # ensure we got what we were looking for.
-        calculated = self.sha256(bytes=data)
+        # ensure we got what we were looking for, discarding the partial file otherwise.
+        calculated = hashfunc.hexdigest()
 
         if calculated != sha256:
+            os.remove(path)
+
             message  = "failed downloading file! expected sha256=%s calculated sha256=%s"
             message %= sha256, calculated
             raise inquestlabs_exception(message)
 
-        # write the file to disk.
-        with open(path, "wb+") as fh:
-            fh.write(data)
-
     ####################################################################################################################
     def dfi_list (self, malicious=None, kind=None, has_code=None, has_context=None, has_metadata=None, has_ocr=None):
         """
@@ -657,16 +1031,15 @@ class inquestlabs_api:
         subcategory = subcategory.lower()
 
         # sanity check.
-        if category not in VALID_CAT:
+        if category not in SUBCATS:
             message  = "invalid category '%s'. valid categories include: %s"
-            message %= category, ", ".join(VALID_CAT)
+            message %= category, _STR_CAT
             raise inquestlabs_exception(message)
 
-        for c, v in zip(VALID_CAT, [VALID_EXT, VALID_HASH, VALID_IOC]):
-            if category == c and subcategory not in v:
-                message  = "invalid subcategory '%s' for category '%s'. valid subcategories include: %s"
-                message %= subcategory, category, ", ".join(v)
-                raise inquestlabs_exception(message)
+        if subcategory not in SUBCATS[category]:
+            message  = "invalid subcategory '%s' for category '%s'. valid subcategories include: %s"
+            message %= subcategory, category, _STR_SUBCATS[category]
+            raise inquestlabs_exception(message)
 
         # API dance.
         if category == "ext":
@@ -677,7 +1050,7 @@ class inquestlabs_api:
         else:
             data = dict(keyword=keyword)
 
-        return self.API("/dfi/search/%s/%s" % (category, subcategory), data)
+        return self.API(_search_url(category, subcategory), data)
 
     ####################################################################################################################
     def dfi_sources (self):
@@ -689,7 +1062,7 @@ class inquestlabs_api:
         :return: API response.
         """
 
-        return self.API("/dfi/sources")
+        return self._cached_api("/dfi/sources")
 
     ####################################################################################################################
     def dfi_upload (self, path):
@@ -704,18 +1077,18 @@ class inquestlabs_api:
         :return: API response.
         """
 
-        VALID_TYPES = ["doc", "docx", "ppt", "pptx", "xls", "xlsx"]
-
         # ensure the path exists and points to a file.
         if not os.path.exists(path) or not os.path.isfile(path):
             raise inquestlabs_exception("invalid file path specified for upload: %s" % path)
 
         # ensure the file is an OLE (pre 2007 Office file) or ZIP (post 2007 Office file).
         with open(path, "rb") as fh:
-            if fh.read(2) not in ["\xD0\xCF", "PK"]:
-                message  = "unsupported file type for upload, valid files include: %s"
-                message %= ", ".join(VALID_TYPES)
-                raise inquestlabs_exception(message)
+            head = fh.read(8)
+
+        if not (head.startswith(_OLE_MAGIC) or head.startswith(_ZIP_MAGIC)):
+            message  = "unsupported file type for upload, valid files include: %s"
+            message %= ", ".join(UPLOAD_TYPES)
+            raise inquestlabs_exception(message)
 
         # dance with the API.
         return self.API("/dfi/upload", method="POST", path=path)
@@ -886,7 +1259,7 @@ class inquestlabs_api:
         :return: List of dictionaries.
         """
 
-        return self.API("/stats")
+        return self._cached_api("/stats")
 
     ####################################################################################################################
     def yara_b64re (self, regex, endian=None):
@@ -986,185 +1359,160 @@ class inquestlabs_api:
 ########################################################################################################################
 ########################################################################################################################
 
-def main ():
-    args = docopt.docopt(__doc__, version=__version__)
+# command words docopt may flag, in the order they compose into a dispatch key: group, action, selector.
+_CLI_GROUPS    = ("dfi", "iocdb", "repdb", "yara", "stats")
+_CLI_ACTIONS   = ("attributes", "bulk-details", "details", "download", "list", "search", "sources", "upload",
+                  "b64re", "base64re", "hexcase", "uint", "widere")
+_CLI_SELECTORS = tuple(VALID_EXT) + tuple(VALID_HASH) + tuple(VALID_IOC)
 
-    # --debug is for docopt argument parsing. useful to pipe to: egrep -v "False|None"
-    if args['--debug']:
-        print(args)
-        return
+########################################################################################################################
+def _active (args, candidates):
+    """
+    Return the first candidate command word flagged true in the docopt argument dictionary, None otherwise.
+    """
 
-    # instantiate interface to InQuest Labs.
-    labs = inquestlabs_api(args['--api'], args['--config'], args['--proxy'], verbose=int(args['--verbose']))
-
-    ### DFI ############################################################################################################
-    if args['dfi']:
-
-        # inquestlabs [options] dfi attributes <sha256> [--filter=<filter>]
-        if args['attributes']:
-            print(json.dumps(labs.dfi_attributes(args['<sha256>'], args['--filter'])))
-
-        # inquestlabs [options] dfi details <sha256> [--attributes]
-        elif args['details']:
-            print(json.dumps(labs.dfi_details(args['<sha256>'], args['--attributes'])))
-
-        # inquestlabs [options] dfi download <sha256> <path>
-        elif args['download']:
-            start = time.time()
-            labs.dfi_download(args['<sha256>'], args['<path>'])
-            print("saved %s as '%s' in %d seconds." % (args['<sha256>'], args['<path>'], time.time() - start))
-
-        # inquestlabs [options] dfi list
-        elif args['list']:
-            print(json.dumps(labs.dfi_list()))
-
-        elif args['search']:
-
-            # inquestlabs [options] dfi search (code|context|metadata|ocr) <keyword>
-            if args['<keyword>']:
-                if args['code']:
-                    results = labs.dfi_search("ext", "code", args['<keyword>'])
-                elif args['context']:
-                    results = labs.dfi_search("ext", "context", args['<keyword>'])
-                elif args['metadata']:
-                    results = labs.dfi_search("ext", "metadata", args['<keyword>'])
-                elif args['ocr']:
-                    results = labs.dfi_search("ext", "ocr", args['<keyword>'])
-                else:
-                    raise inquestlabs_exception("keyword search argument parsing fail.")
-
-            # inquestlabs [options] dfi search (md5|sha1|sha256|sha512) <hash>
-            elif args['<hash>']:
-                if args['md5']:
-                    results = labs.dfi_search("hash", "md5", args['<hash>'])
-                elif args['sha1']:
-                    results = labs.dfi_search("hash", "sha1", args['<hash>'])
-                elif args['sha256']:
-                    results = labs.dfi_search("hash", "sha256", args['<hash>'])
-                elif args['sha512']:
-                    results = labs.dfi_search("hash", "sha512", args['<hash>'])
-                else:
-                    raise inquestlabs_exception("hash search argument parsing fail.")
-
-            # inquestlabs [options] dfi search (domain|email|filename|ip|url|xmpid) <ioc>
-            elif args['<ioc>']:
-                if args['domain']:
-                    results = labs.dfi_search("ioc", "domain", args['<ioc>'])
-                elif args['email']:
-                    results = labs.dfi_search("ioc", "email", args['<ioc>'])
-                elif args['filename']:
-                    results = labs.dfi_search("ioc", "filename", args['<ioc>'])
-                elif args['ip']:
-                    results = labs.dfi_search("ioc", "ip", args['<ioc>'])
-                elif args['url']:
-                    results = labs.dfi_search("ioc", "url", args['<ioc>'])
-                elif args['xmpid']:
-                    results = labs.dfi_search("ioc", "xmpid", args['<ioc>'])
-                else:
-                    raise inquestlabs_exception("ioc search argument parsing fail.")
+    for candidate in candidates:
+        if args.get(candidate):
+            return candidate
 
-            # search results.
-            print(json.dumps(results))
+    return None
 
-        # inquestlabs [options] dfi sources
-        elif args['sources']:
-            print(json.dumps(labs.dfi_sources()))
+########################################################################################################################
+def _command_key (args):
+    """
+    Distill the docopt argument dictionary down to the tuple of active command words, our dispatch table key.
+    """
 
-        # inquestlabs [options] dfi upload <path>
-        elif args['upload']:
-            start  = time.time()
-            sha256 = labs.dfi_upload(args['<path>'])
-            print("successfully uploaded %s in %d seconds." % (args['<path>'], time.time() - start))
-            print("see results at: https://labs.inquest.net/dfi/sha256/%s" % sha256)
+    words = (_active(args, _CLI_GROUPS), _active(args, _CLI_ACTIONS), _active(args, _CLI_SELECTORS))
 
-        # huh?
-        else:
-            raise inquestlabs_exception("dfi argument parsing fail.")
+    return tuple(word for word in words if word)
 
-    ### IOCDB ##########################################################################################################
-    elif args['iocdb']:
+########################################################################################################################
+def _endian (args):
+    """
+    Normalize the big/little endian CLI switches down to the API-expected keyword.
+    """
 
-        # inquestlabs [options] iocdb list
-        if args['list']:
-            print(json.dumps(labs.iocdb_list()))
+    if args['--big-endian']:
+        return "BIG"
 
-        # inquestlabs [options] iocdb search <keyword>
-        elif args['search']:
-            print(json.dumps(labs.iocdb_search(args['<keyword>'])))
+    if args['--little-endian']:
+        return "LITTLE"
 
-        # inquestlabs [options] iocdb sources
-        elif args['sources']:
-            print(json.dumps(labs.iocdb_sources()))
+    return None
 
-        # huh?
-        else:
-            raise inquestlabs_exception("iocdb argument parsing fail.")
+########################################################################################################################
+def _dfi_download (labs, args):
+    # inquestlabs [options] dfi download <sha256> <path>
+    start = time.time()
+    labs.dfi_download(args['<sha256>'], args['<path>'])
 
-    ### REPDB ##########################################################################################################
-    elif args['repdb']:
+    return "saved %s as '%s' in %d seconds." % (args['<sha256>'], args['<path>'], time.time() - start)
 
-        # inquestlabs [options] repdb list
-        if args['list']:
-            print(json.dumps(labs.repdb_list()))
+########################################################################################################################
+def _dfi_upload (labs, args):
+    # inquestlabs [options] dfi upload <path>
+    start  = time.time()
+    sha256 = labs.dfi_upload(args['<path>'])
 
-        # inquestlabs [options] repdb search <keyword>
-        elif args['search']:
-            print(json.dumps(labs.repdb_search(args['<keyword>'])))
+    message  = "successfully uploaded %s in %d seconds.\nsee results at: https://labs.inquest.net/dfi/sha256/%s"
+    message %= args['<path>'], time.time() - start, sha256
 
-        # inquestlabs [options] repdb sources
-        elif args['sources']:
-            print(json.dumps(labs.repdb_sources()))
+    return message
 
-        # huh?
-        else:
-            raise inquestlabs_exception("repdb argument parsing fail.")
+########################################################################################################################
+def _dfi_bulk_details (labs, args):
+    # inquestlabs [options] dfi bulk-details <path>
+    with open(args['<path>']) as fh:
+        sha256s = [line.strip() for line in fh if line.strip()]
 
-    ### YARA ###########################################################################################################
-    elif args['yara']:
+    return _dumps(labs.dfi_details_batch(sha256s))
 
-        # normalize big/little endian switches.
-        if args['--big-endian']:
-            endian = "BIG"
-        elif args['--little-endian']:
-            endian = "LITTLE"
-        else:
-            endian = None
+########################################################################################################################
+def _dfi_search (category, subcategory, argname):
+    """
+    Manufacture a dispatch handler for one of the category/subcategory DFI search combinations.
+    """
+
+    def handler (labs, args):
+        return _dumps(labs.dfi_search(category, subcategory, args[argname]))
 
-        # NOTE: we don't json.dumps() these values as they are likely going to be wanted to be used raw and not piped
-        #       into another JSON expectant tool.
+    return handler
 
-        # inquestlabs [options] yara (b64re|base64re) <regex> [(--big-endian|--little-endian)]
-        if args['b64re'] or args['base64re']:
-            print(labs.yara_b64re(args['<regex>'], endian))
+########################################################################################################################
+# O(1) dispatch table keyed by the tuple of active command words, built once at module load. handlers return the
+# string to print (already JSON encoded where appropriate) or None if there is nothing to say.
+#
+# NOTE: we don't json.dumps() the yara values as they are likely going to be wanted to be used raw and not piped
+#       into another JSON expectant tool.
+DISPATCH = \
+{
+    ("dfi",   "attributes")  : lambda labs, args: _dumps(labs.dfi_attributes(args['<sha256>'], args['--filter'])),
+    ("dfi",   "bulk-details"): _dfi_bulk_details,
+    ("dfi",   "details")     : lambda labs, args: _dumps(labs.dfi_details(args['<sha256>'], args['--attributes'])),
+    ("dfi",   "download")    : _dfi_download,
+    ("dfi",   "list")        : lambda labs, args: _dumps(labs.dfi_list()),
+    ("dfi",   "sources")     : lambda labs, args: _dumps(labs.dfi_sources()),
+    ("dfi",   "upload")      : _dfi_upload,
+    ("iocdb", "list")        : lambda labs, args: _dumps(labs.iocdb_list()),
+    ("iocdb", "search")      : lambda labs, args: _dumps(labs.iocdb_search(args['<keyword>'])),
+    ("iocdb", "sources")     : lambda labs, args: _dumps(labs.iocdb_sources()),
+    ("repdb", "list")        : lambda labs, args: _dumps(labs.repdb_list()),
+    ("repdb", "search")      : lambda labs, args: _dumps(labs.repdb_search(args['<keyword>'])),
+    ("repdb", "sources")     : lambda labs, args: _dumps(labs.repdb_sources()),
+    ("yara",  "b64re")       : lambda labs, args: labs.yara_b64re(args['<regex>'], _endian(args)),
+    ("yara",  "base64re")    : lambda labs, args: labs.yara_b64re(args['<regex>'], _endian(args)),
+    ("yara",  "hexcase")     : lambda labs, args: labs.yara_hexcase(args['<instring>']),
+    ("yara",  "uint")        : lambda labs, args: labs.yara_uint(args['<instring>'], args['--offset'], args['--hex']),
+    ("yara",  "widere")      : lambda labs, args: labs.yara_widere(args['<regex>'], _endian(args)),
+    ("stats",)               : lambda labs, args: _dumps(labs.stats()),
+}
+
+# splice in the 18 category/subcategory DFI search combinations.
+for _subcategory in VALID_EXT:
+    DISPATCH[("dfi", "search", _subcategory)] = _dfi_search("ext", _subcategory, "<keyword>")
+
+for _subcategory in VALID_HASH:
+    DISPATCH[("dfi", "search", _subcategory)] = _dfi_search("hash", _subcategory, "<hash>")
+
+for _subcategory in VALID_IOC:
+    DISPATCH[("dfi", "search", _subcategory)] = _dfi_search("ioc", _subcategory, "<ioc>")
 
-        # inquestlabs [options] yara hexcase <instring>
-        elif args['hexcase']:
-            print(labs.yara_hexcase(args['<instring>']))
+########################################################################################################################
+def main ():
+    args = docopt.docopt(__doc__, version=__version__)
 
-        # inquestlabs [options] yara uint <instring> [--offset=<offset>] [--hex]
-        elif args['uint']:
-            print(labs.yara_uint(args['<instring>'], args['--offset'], args['--hex']))
+    # --debug is for docopt argument parsing. useful to pipe to: egrep -v "False|None"
+    if args['--debug']:
+        print(args)
+        return
 
-        # inquestlabs [options] yara widere <regex> [(--big-endian|--little-endian)]
-        elif args['widere']:
-            print(labs.yara_widere(args['<regex>'], endian))
+    # instantiate interface to InQuest Labs.
+    labs = inquestlabs_api(args['--api'], args['--config'], args['--proxy'], verbose=int(args['--verbose']),
+                           http_cache=not args['--no-cache'])
 
-        # huh?
-        else:
-            raise inquestlabs_exception("yara argument parsing fail.")
+    # flush any persistent HTTP cache when asked.
+    if args['--clear-cache'] and hasattr(labs.session, "cache"):
+        labs.session.cache.clear()
 
-    ### MISCELLANEOUS ##################################################################################################
-    elif args['stats']:
-        print(json.dumps(labs.stats()))
+    ### DISPATCH #######################################################################################################
+    handler = DISPATCH.get(_command_key(args))
 
     # huh?
-    else:
+    if handler is None:
         raise inquestlabs_exception("argument parsing fail.")
 
+    output = handler(labs, args)
+
+    if output is not None:
+        print(output)
+
     ### WRAP UP ########################################################################################################
     if args['--limits']:
         sys.stderr.write(labs.rate_limit_banner() + "\n")
 
+    labs.close()
+
 ########################################################################################################################
 if __name__ == '__main__':
     main()
@@ -3,17 +3,40 @@ import sys
 import os
 sys.path.insert(1, os.path.join(sys.path[0], '..'))
 from inquestlabs import inquestlabs_api
-import requests_mock
-import requests
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def labs():
-    labs = inquestlabs_api()
+    # a single attempt keeps any test that reaches the real retry machinery from
+    # burning wall clock on back-off sleeps.
+    labs = inquestlabs_api(retries=1)
     return labs
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def labs_with_key():
-    labs_api = inquestlabs_api(api_key="mock")
+    labs_api = inquestlabs_api(api_key="mock", retries=1)
     return labs_api
 
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_sleep():
+    # back-off waits add nothing to mocked tests, neuter time.sleep for the whole
+    # session. works transparently per xdist worker.
+    import time
+    from unittest import mock
+
+    with mock.patch.object(time, "sleep", lambda *args, **kwargs: None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(labs, labs_with_key):
+    # session-scoped clients share their in-process response cache, flush it so
+    # one test's cached payloads never bleed into the next.
+    labs.invalidate_cache()
+    labs_with_key.invalidate_cache()
+
+
+@pytest.fixture(params=["labs", "labs_with_key"])
+def client(request, labs, labs_with_key):
+    return dict(labs=labs, labs_with_key=labs_with_key)[request.param]
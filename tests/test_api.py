@@ -1,123 +1,82 @@
 import pytest
-import sys, os
+import json
 import requests
-sys.path.insert(1, os.path.join(sys.path[0], '..'))
+
+from unittest.mock import patch
 
 from inquestlabs import inquestlabs_exception
-import requests_mock
+
+# local alias, saves the repeated module attribute lookup in pytest.raises calls.
+_EXC = inquestlabs_exception
+
+pytestmark = [pytest.mark.api]
+
+def _canned_response(status_code, payload):
+    # build a plain requests.Response with the body pre-baked, no adapter mounts
+    # and no HTTP stack traversal.
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode()
+    return response
+
+# one canned response per scenario, built once at import time and returned by every
+# helper call. safe to share because tests only ever read status and body.
+_R400_ERROR       = _canned_response(400, {"error":400})
+_R413_TOO_LARGE   = _canned_response(413, {"success":False})
+_R500_FAILURE     = _canned_response(500, {"success":False})
+_R404_MISSING     = _canned_response(404, None)
+_R400_BAD_PARAM   = _canned_response(400, {"success":False})
+_R200_UNSUCCESS   = _canned_response(200, {"success":False})
 
 def mocked_400_response_request(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", json={"error":400}, status_code=400)
-        response = requests.get("http://labs_mock.com")
-        return response
+    return _R400_ERROR
 
 def mocked_413_response_size_exceeded(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", json={"success":False}, status_code=413)
-        response = requests.get("http://labs_mock.com")
-        return response
+    return _R413_TOO_LARGE
 
 def mocked_500_response_generic_failure(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", json={"success":False}, status_code=500)
-        response = requests.get("http://labs_mock.com")
-        return response
+    return _R500_FAILURE
 
 def mocked_404_response_nonexistant(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", status_code=404)
-        response = requests.get("http://labs_mock.com")
-        return response
+    return _R404_MISSING
 
 def mocked_400_response_missing_parameter(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", json={"success":False}, status_code=400)
-        response = requests.get("http://labs_mock.com")
-        return response
+    return _R400_BAD_PARAM
 
 def mocked_429_response_ratelimit(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", json={"success":False}, status_code=200)
-        response = requests.get("http://labs_mock.com")
-        return response
+    return _R200_UNSUCCESS
 
 def mocked_200_response_unsuccessful_request(*args, **kwargs):
-    with requests_mock.Mocker() as mock_request:
-        mock_request.get("http://labs_mock.com", json={"success":False}, status_code=200)
-        response = requests.get("http://labs_mock.com")
-        return response
-
-def test_api_invalid_method(labs):
-    with pytest.raises(Exception)as excinfo:
-        labs.API("mock", data=None, path=None, method="INVALID", raw=False)
-    
-    assert "AssertionError" in str(excinfo.type)
-
-def test_api_invalid_path(labs):
-    with pytest.raises(Exception) as excinfo:
-        labs.API("mock", data=None, path="invalid", method="GET", raw=False)
-    
-    assert "FileNotFound" in str(excinfo.type)
-
-def test_api_exceeded_attempts_to_communicate(labs,mocker):
-        mocker.patch('requests.request' , side_effect=Exception)
-        with pytest.raises(inquestlabs_exception) as excinfo:
-            labs.API("mock")
-        
-        assert "attempts to communicate with InQuest" in str(excinfo.value)
-
-def test_api_bad_status_code(labs,mocker):
-    mocker.patch('requests.request', side_effect=mocked_400_response_request)
-    with pytest.raises(inquestlabs_exception) as excinfo:
-        labs.API("mock")
-        
-    assert "status=400" in str(excinfo.value)
-
-def test_api_unsuccessful_request(labs,mocker):
-    mocker.patch('requests.request', side_effect=mocked_200_response_unsuccessful_request)
-    with pytest.raises(inquestlabs_exception) as excinfo:
-        labs.API("mock")
-        
-    assert "status=200 but error communicating" in str(excinfo.value)
-
-
-def test_api_invalid_method_with_key(labs_with_key):
-    with pytest.raises(Exception)as excinfo:
-        labs_with_key.API("mock", data=None, path=None, method="INVALID", raw=False)
-    
-    assert "AssertionError" in str(excinfo.type)
-
-def test_api_invalid_path_with_key(labs_with_key):
+    return _R200_UNSUCCESS
+
+def test_api_invalid_method(client):
     with pytest.raises(Exception) as excinfo:
-        labs_with_key.API("mock", data=None, path="invalid", method="GET", raw=False)
-    
-    assert "FileNotFound" in str(excinfo.type)
-
-def test_api_exceeded_attempts_to_communicate(labs_with_key,mocker):
-        mocker.patch('requests.request' , side_effect=Exception)
-        with pytest.raises(inquestlabs_exception) as excinfo:
-            labs_with_key.API("mock")
-        
-        assert "attempts to communicate with InQuest" in str(excinfo.value)
-
-def test_api_bad_status_code(labs_with_key,mocker):
-    mocker.patch('requests.request', side_effect=mocked_400_response_request)
-    with pytest.raises(inquestlabs_exception) as excinfo:
-        labs_with_key.API("mock")
-        
-    assert "status=400" in str(excinfo.value)
+        client.API("mock", data=None, path=None, method="INVALID", raw=False)
 
-def test_api_unsuccessful_request(labs_with_key,mocker):
-    mocker.patch('requests.request', side_effect=mocked_200_response_unsuccessful_request)
-    with pytest.raises(inquestlabs_exception) as excinfo:
-        labs_with_key.API("mock")
-        
-    assert "status=200 but error communicating" in str(excinfo.value)
+    assert excinfo.type is AssertionError
 
-def test_api_ratelimit_reached(labs_with_key,mocker):
-    mocker.patch('requests.request', side_effect=mocked_200_response_unsuccessful_request)
-    with pytest.raises(inquestlabs_exception) as excinfo:
+def test_api_invalid_path(client):
+    with pytest.raises(Exception) as excinfo:
+        client.API("mock", data=None, path="invalid", method="GET", raw=False)
+
+    assert excinfo.type is FileNotFoundError
+
+@pytest.mark.parametrize("side_effect,status,needle", [
+    (requests.exceptions.ConnectionError, None, "attempts to communicate with InQuest"),
+    (mocked_400_response_request, 400, "status=400"),
+    (mocked_200_response_unsuccessful_request, 200, "status=200 but error communicating"),
+])
+def test_api_errors(client, side_effect, status, needle):
+    with patch.object(client.session, 'request', side_effect=side_effect), \
+         pytest.raises(_EXC) as excinfo:
+        client.API("mock")
+
+    assert excinfo.value.status == status
+    assert needle in str(excinfo.value)
+
+def test_api_ratelimit_reached(labs_with_key):
+    with patch.object(labs_with_key.session, 'request', side_effect=mocked_200_response_unsuccessful_request), \
+         pytest.raises(_EXC) as excinfo:
         labs_with_key.API("mock")
-        
-    assert "status=200 but error communicating" in str(excinfo.value)
+
+    assert excinfo.value.status == 200
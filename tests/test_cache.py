@@ -0,0 +1,47 @@
+import pytest
+
+
+def test_cached_api_short_circuits_repeat_calls(labs, mocker):
+    mocked = mocker.patch('inquestlabs.inquestlabs_api.API', return_value=["source1", "source2", "etc"])
+
+    labs.invalidate_cache()
+    assert labs.dfi_sources() == ["source1", "source2", "etc"]
+    assert labs.dfi_sources() == ["source1", "source2", "etc"]
+
+    assert mocked.call_count == 1
+
+
+def test_invalidate_cache_forces_fresh_fetch(labs, mocker):
+    mocked = mocker.patch('inquestlabs.inquestlabs_api.API', return_value=["source1", "source2", "etc"])
+
+    labs.invalidate_cache()
+    labs.dfi_sources()
+    labs.invalidate_cache()
+    labs.dfi_sources()
+
+    assert mocked.call_count == 2
+
+
+def test_cache_expires_after_ttl(labs, mocker):
+    mocked = mocker.patch('inquestlabs.inquestlabs_api.API', return_value=["source1", "source2", "etc"])
+
+    labs.invalidate_cache()
+    labs.dfi_sources()
+
+    # fast-forward past the TTL by rewinding the stored expiry.
+    key = ("/dfi/sources", ())
+    expiry, value = labs._cache[key]
+    labs._cache[key] = (expiry - labs._cache_ttl - 1, value)
+
+    labs.dfi_sources()
+    assert mocked.call_count == 2
+
+
+def test_cached_api_short_circuits_repeat_calls_with_key(labs_with_key, mocker):
+    mocked = mocker.patch('inquestlabs.inquestlabs_api.API', return_value=["source1", "source2", "etc"])
+
+    labs_with_key.invalidate_cache()
+    assert labs_with_key.dfi_sources() == ["source1", "source2", "etc"]
+    assert labs_with_key.dfi_sources() == ["source1", "source2", "etc"]
+
+    assert mocked.call_count == 1
@@ -60,7 +60,7 @@ def mock_invalid_hash_response(*args, **kwargs):
 
 
 def test_dfi_details_invalid_hash(labs, mocker):
-    mocker.patch('requests.request', side_effect=mock_invalid_hash_response)
+    mocker.patch.object(labs.session, 'request', side_effect=mock_invalid_hash_response)
 
     with pytest.raises(AssertionError) as excinfo:
         labs.dfi_details("mock")
@@ -90,7 +90,7 @@ def test_dfi_details_with_attributes(labs, mocker):
 
 
 def test_dfi_details_invalid_hash_with_key(labs_with_key, mocker):
-    mocker.patch('requests.request', side_effect=mock_invalid_hash_response)
+    mocker.patch.object(labs_with_key.session, 'request', side_effect=mock_invalid_hash_response)
 
     with pytest.raises(AssertionError) as excinfo:
         labs_with_key.dfi_details("mock")
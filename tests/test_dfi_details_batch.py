@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.fixture
+def mock_hashes():
+    return ["1e9e3b4aaab8fd2f9775800578e9b0bcc4980c2e615bf0f706e142c63f36e710",
+            "30c53168deee9046d41d3e602e0e598c2cf0880fed1a34b957f5f3bd9361b52c"]
+
+
+def test_dfi_details_batch_preserves_order(labs, mocker, mock_hashes):
+    mocker.patch('inquestlabs.inquestlabs_api.dfi_details',
+                 side_effect=lambda sha256, attributes: dict(sha256=sha256))
+
+    results = labs.dfi_details_batch(mock_hashes)
+    assert [entry["sha256"] for entry in results] == mock_hashes
+
+
+def test_dfi_details_batch_preserves_order_with_key(labs_with_key, mocker, mock_hashes):
+    mocker.patch('inquestlabs.inquestlabs_api.dfi_details',
+                 side_effect=lambda sha256, attributes: dict(sha256=sha256))
+
+    results = labs_with_key.dfi_details_batch(mock_hashes)
+    assert [entry["sha256"] for entry in results] == mock_hashes
@@ -0,0 +1,47 @@
+import sys
+
+import pytest
+
+from inquestlabs import inquestlabs_exception
+
+
+@pytest.fixture
+def mock_hashes():
+    return ["1e9e3b4aaab8fd2f9775800578e9b0bcc4980c2e615bf0f706e142c63f36e710",
+            "30c53168deee9046d41d3e602e0e598c2cf0880fed1a34b957f5f3bd9361b52c"]
+
+
+def test_dfi_details_many_invalid_hash(labs):
+    with pytest.raises(AssertionError) as excinfo:
+        labs.dfi_details_many(["mock"])
+
+    assert "AssertionError" in str(excinfo)
+
+
+def test_dfi_details_many_missing_aiohttp(labs, mocker, mock_hashes):
+    # reset the deferred module-scope binding and make the lazy import fail.
+    mocker.patch('inquestlabs.aiohttp', None)
+    mocker.patch.dict(sys.modules, {"aiohttp": None})
+
+    with pytest.raises(inquestlabs_exception) as excinfo:
+        labs.dfi_details_many(mock_hashes)
+
+    assert "aiohttp" in str(excinfo.value)
+
+
+def test_dfi_details_many_invalid_hash_with_key(labs_with_key):
+    with pytest.raises(AssertionError) as excinfo:
+        labs_with_key.dfi_details_many(["mock"])
+
+    assert "AssertionError" in str(excinfo)
+
+
+def test_dfi_details_many_missing_aiohttp_with_key(labs_with_key, mocker, mock_hashes):
+    # reset the deferred module-scope binding and make the lazy import fail.
+    mocker.patch('inquestlabs.aiohttp', None)
+    mocker.patch.dict(sys.modules, {"aiohttp": None})
+
+    with pytest.raises(inquestlabs_exception) as excinfo:
+        labs_with_key.dfi_details_many(mock_hashes)
+
+    assert "aiohttp" in str(excinfo.value)
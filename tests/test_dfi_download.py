@@ -13,8 +13,12 @@ def mock_hash():
     return "1e9e3b4aaab8fd2f9775800578e9b0bcc4980c2e615bf0f706e142c63f36e710"
 
 @pytest.fixture
-def mock_hash_data():
-    return bytearray('mock data inside this hash','utf-8')
+def mock_hash_response():
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'mock data inside this hash'
+    response._content_consumed = True
+    return response
 
 def mock_invalid_hash_response(*args, **kwargs):
     with requests_mock.Mocker() as mock_request:
@@ -23,34 +27,38 @@ def mock_invalid_hash_response(*args, **kwargs):
         return response
 
 def test_download_invalid_sha256(labs,mocker):
-    mocker.patch('requests.request', side_effect=mock_invalid_hash_response)
+    mocker.patch.object(labs.session, 'request', side_effect=mock_invalid_hash_response)
 
     with pytest.raises(AssertionError) as excinfo:
         labs.dfi_download("mock","fake_path")
 
     assert "AssertionError" in str(excinfo)
 
-def test_download_invalid_path(labs, mocker, mock_hash, mock_hash_data):
-    mocker.patch('inquestlabs.inquestlabs_api.API', return_value=mock_hash_data)
+def test_download_hash_mismatch(labs, mocker, mock_hash, mock_hash_response, tmp_path):
+    mocker.patch('inquestlabs.inquestlabs_api.API', return_value=mock_hash_response)
+    path = str(tmp_path / "sample.bin")
 
     with pytest.raises(inquestlabs_exception) as excinfo:
-        labs.dfi_download(mock_hash,"/path/does/not/exist")
+        labs.dfi_download(mock_hash, path)
 
     assert "failed downloading file" in str(excinfo.value)
+    assert not (tmp_path / "sample.bin").exists()
 
 
 def test_download_invalid_sha256_with_key(labs_with_key,mocker):
-    mocker.patch('requests.request', side_effect=mock_invalid_hash_response)
+    mocker.patch.object(labs_with_key.session, 'request', side_effect=mock_invalid_hash_response)
 
     with pytest.raises(AssertionError) as excinfo:
         labs_with_key.dfi_download("mock","fake_path")
 
     assert "AssertionError" in str(excinfo)
 
-def test_download_invalid_path_with_key(labs_with_key, mocker, mock_hash, mock_hash_data):
-    mocker.patch('inquestlabs.inquestlabs_api.API', return_value=mock_hash_data)
+def test_download_hash_mismatch_with_key(labs_with_key, mocker, mock_hash, mock_hash_response, tmp_path):
+    mocker.patch('inquestlabs.inquestlabs_api.API', return_value=mock_hash_response)
+    path = str(tmp_path / "sample.bin")
 
     with pytest.raises(inquestlabs_exception) as excinfo:
-        labs_with_key.dfi_download(mock_hash,"/path/does/not/exist")
+        labs_with_key.dfi_download(mock_hash, path)
 
     assert "failed downloading file" in str(excinfo.value)
+    assert not (tmp_path / "sample.bin").exists()
@@ -5,12 +5,12 @@ from inquestlabs import inquestlabs_exception
 
 @pytest.fixture
 def mock_invalid_doc():
-    return "test"
+    return b"test"
 
 
 @pytest.fixture
 def mock_valid_doc():
-    return "[\xD0\xCF]"
+    return b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1"
 
 
 @pytest.fixture
@@ -22,7 +22,7 @@ def test_invalid_upload_type(labs, mocker, mock_invalid_doc):
     mocker.patch("os.path.exists", return_value=True)
     mocker.patch("os.path.isfile", return_value=True)
     mocker.patch('builtins.open', mocker.mock_open(
-        read_data='invalid'), create=True)
+        read_data=b'invalid'), create=True)
     with pytest.raises(inquestlabs_exception) as excinfo:
         labs.dfi_upload("mock")
 
@@ -33,7 +33,7 @@ def test_valid_upload_type(labs, mocker, mock_valid_doc, mock_valid_response):
     mocker.patch("os.path.exists", return_value=True)
     mocker.patch("os.path.isfile", return_value=True)
     mocker.patch('builtins.open', mocker.mock_open(
-        read_data='PK'), create=True)
+        read_data=b'PK\x03\x04'), create=True)
     mocker.patch('inquestlabs.inquestlabs_api.API',
                  return_value=mock_valid_response)
     response = labs.dfi_upload("mock")
@@ -71,7 +71,7 @@ def test_valid_upload_type_with_key(labs_with_key, mocker, mock_valid_doc, mock_
     mocker.patch("os.path.exists", return_value=True)
     mocker.patch("os.path.isfile", return_value=True)
     mocker.patch('builtins.open', mocker.mock_open(
-        read_data='PK'), create=True)
+        read_data=b'PK\x03\x04'), create=True)
     mocker.patch('inquestlabs.inquestlabs_api.API',
                  return_value=mock_valid_response)
     response = labs_with_key.dfi_upload("mock")